@@ -24,6 +24,146 @@ def load_data():
 
 df = load_data()
 
+# Konstanta simulasi skenario cuaca
+SIM_WEATHER = ['clear', 'mist', 'light rain']
+SIM_MIN_SEGMENT_DAYS = 3
+TEMP_MAX_C = 41     # temperature pada dataset dinormalisasi: t / 41
+HUM_MAX_PCT = 100   # humidity pada dataset dinormalisasi: h / 100
+SIM_PERIOD_ORDER = {
+    'month': ['january', 'february', 'march', 'april', 'may', 'june',
+              'july', 'august', 'september', 'october', 'november', 'december'],
+    'season': ['spring', 'summer', 'fall', 'winter']
+}
+SIM_FALLBACK_NAMES = {
+    'adjacent': 'periode ini dan periode di sebelahnya',
+    'season': 'musim yang sama',
+    'all': 'semua periode'
+}
+
+def covariate_terms(covariates):
+    """Suku suhu/kelembaban untuk model respons cuaca: [temp, hum, temp², hum²]."""
+    return np.column_stack([covariates, covariates ** 2])
+
+def allocate_days(shares, horizon):
+    """Bagi horizon menjadi jumlah hari per cuaca (largest remainder) agar totalnya tepat."""
+    raw = np.array([shares.get(w, 0) for w in SIM_WEATHER]) * horizon
+    days = np.floor(raw).astype(int)
+    remainder_order = np.argsort(-(raw - days), kind='stable')
+    days[remainder_order[:horizon - days.sum()]] += 1
+    return [int(d) for d in days]
+
+@st.cache_data(max_entries=64)
+def build_weather_segments(_df_day, period_col, period_value, years):
+    """Distribusi empiris casual/registered per kondisi cuaca untuk satu periode.
+
+    Segmen dengan hari historis terlalu sedikit diperluas bertahap: periode
+    di sebelahnya, lalu musim yang sama (khusus bulan), dan terakhir semua
+    periode pada tahun terpilih. Respons terhadap suhu dan kelembaban
+    diestimasi sekali pada semua hari tahun terpilih: OLS atas log(1 + penyewaan)
+    dengan suku kuadrat suhu/kelembaban serta efek tetap bulan, tahun, dan
+    cuaca, sehingga tidak bergantung pada sedikit hari dalam satu periode.
+    Nilai setiap hari disesuaikan ke level tahun terbaru terpilih memakai efek tahun.
+    Hari pinjaman dari luar periode digeser melalui model ke iklim dan level
+    bulan periode terpilih, sehingga tidak membawa suhu/level musim asalnya.
+    """
+    base = _df_day[_df_day['year'].isin(years)]
+    period_df = base[base[period_col] == period_value]
+    covariates = period_df[['temperature', 'humidity']].to_numpy(dtype=float)
+
+    months = SIM_PERIOD_ORDER['month']
+    X = np.column_stack(
+        [covariate_terms(base[['temperature', 'humidity']].to_numpy(dtype=float))] +
+        [(base['month'] == m).astype(float) for m in months] +
+        [(base['year'] == y).astype(float) for y in years[1:]] +
+        [(base['weather_condition'] == w).astype(float) for w in SIM_WEATHER[1:]]
+    )
+    Y = np.log1p(base[['casual', 'registered']].to_numpy(dtype=float))
+    coef = np.linalg.lstsq(X, Y, rcond=None)[0]
+    n_terms = 4 + len(months)
+    # Efek tahun (skala log) relatif terhadap tahun pertama; baris terakhir = tahun terbaru
+    year_effect = np.vstack([np.zeros(2), coef[n_terms:n_terms + len(years) - 1]])
+    model = {
+        'beta': coef[:4],  # baris: covariate_terms, kolom: [casual, registered]
+        'cov_low': covariates.min(axis=0),
+        'cov_high': covariates.max(axis=0)
+    }
+    month_effect = pd.DataFrame(coef[4:n_terms], index=months)
+    month_climate = base.groupby('month')[['temperature', 'humidity']].mean()
+    target_effect = month_effect.loc[period_df['month']].to_numpy().mean(axis=0)
+    target_climate = covariates.mean(axis=0)
+
+    # Kandidat pool hari, dari yang paling dekat dengan periode terpilih
+    order = SIM_PERIOD_ORDER[period_col]
+    pos = order.index(period_value)
+    adjacent = [order[(pos + k) % len(order)] for k in (-1, 0, 1)]
+    pools = [
+        (None, period_df),
+        ('adjacent', base[base[period_col].isin(adjacent)])
+    ]
+    if period_col == 'month':
+        pools.append(('season', base[base['season'].isin(period_df['season'].unique())]))
+    pools.append(('all', base))
+
+    segments = {}
+    for w in SIM_WEATHER:
+        for fallback, pool in pools:
+            seg = pool[pool['weather_condition'] == w]
+            if len(seg) >= SIM_MIN_SEGMENT_DAYS:
+                break
+        # Samakan level setiap hari ke tahun terbaru terpilih (skala log)
+        year_pos = np.searchsorted(years, seg['year'].to_numpy())
+        log_values = np.log1p(seg[['casual', 'registered']].to_numpy(dtype=float))
+        log_values = log_values + year_effect[-1] - year_effect[year_pos]
+        seg_covariates = seg[['temperature', 'humidity']].to_numpy(dtype=float)
+
+        # Hari dari luar periode: pertahankan anomali terhadap rata-rata bulannya,
+        # pindahkan ke iklim periode, lalu sesuaikan level bulan dan respons cuaca
+        outside = (seg[period_col] != period_value).to_numpy()
+        if outside.any():
+            own = seg_covariates[outside]
+            moved = np.clip(own - month_climate.loc[seg['month'][outside]].to_numpy() + target_climate,
+                            model['cov_low'], model['cov_high'])
+            log_values[outside] += (
+                target_effect - month_effect.loc[seg['month'][outside]].to_numpy() +
+                (covariate_terms(moved) - covariate_terms(own)) @ model['beta']
+            )
+            seg_covariates[outside] = moved
+
+        segments[w] = {
+            'log_values': log_values,
+            'covariates': seg_covariates,
+            'fallback': fallback
+        }
+    return segments, model
+
+@st.cache_data(max_entries=256, ttl=3600)
+def simulate_weather_scenario(_df_day, period_col, period_value, years, day_mix,
+                              temp_shift, hum_shift, n_boot=5000, seed=42):
+    """Bootstrap total casual/registered untuk campuran hari cuaca tertentu.
+
+    Suhu dan kelembaban setiap hari historis digeser, dibatasi pada rentang
+    yang teramati di periode, lalu selisih prediksi model (skala log)
+    diterapkan ke nilai hari tersebut. Setiap kondisi cuaca di-resample
+    sekaligus sebagai matriks indeks (n_boot x jumlah hari), sehingga
+    hasilnya berukuran (n_boot, 2).
+    """
+    segments, model = build_weather_segments(_df_day, period_col, period_value, years)
+    shift = np.array([temp_shift / TEMP_MAX_C, hum_shift / HUM_MAX_PCT])
+
+    rng = np.random.default_rng(seed)
+    totals = np.zeros((n_boot, 2))
+    for w, n_days in zip(SIM_WEATHER, day_mix):
+        log_values = segments[w]['log_values']
+        if n_days == 0:
+            continue
+        covariates = segments[w]['covariates']
+        shifted = np.clip(covariates + shift, model['cov_low'], model['cov_high'])
+        response = (covariate_terms(shifted) - covariate_terms(covariates)) @ model['beta']
+        values = np.clip(np.expm1(log_values + response), 0, None)
+        idx = rng.integers(0, len(values), size=(n_boot, n_days))
+        totals += values[idx].sum(axis=1)
+    return totals
+
 # Sidebar - Profil dan Filter
 with st.sidebar:
     st.image("https://cdn-icons-png.flaticon.com/512/2972/2972185.png", width=150)
@@ -340,6 +480,136 @@ st.success("""
 
 st.markdown("---")
 
+# ============================================================================
+# SIMULASI: Skenario What-If Cuaca
+# ============================================================================
+st.header("🔮 Simulasi Skenario Cuaca (What-If)")
+st.markdown("---")
+
+if not selected_years:
+    st.warning("Pilih minimal satu tahun pada filter untuk menjalankan simulasi.")
+else:
+    years_key = tuple(sorted(selected_years))
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.subheader("⚙️ Parameter Skenario")
+
+        period_type = st.radio("Periode", options=['Bulan', 'Musim'], horizontal=True)
+        if period_type == 'Bulan':
+            period_col = 'month'
+            period_value = st.selectbox(
+                "Bulan",
+                options=month_order,
+                format_func=lambda x: month_names_id.get(x, x)
+            )
+        else:
+            period_col = 'season'
+            period_value = st.selectbox(
+                "Musim",
+                options=season_order,
+                format_func=lambda x: season_names_id.get(x, x)
+            )
+
+        # Panjang periode dan default campuran hari mengikuti data historis periode terpilih
+        period_hist = df[df['year'].isin(selected_years) & (df[period_col] == period_value)]
+        horizon = int(round(len(period_hist) / len(selected_years)))
+        weather_share = period_hist['weather_condition'].value_counts(normalize=True)
+        default_mix = allocate_days(weather_share, horizon)
+
+        # Hari cerah dan berkabut diatur slider, hujan ringan = sisa hari periode
+        day_mix = []
+        remaining = horizon
+        for w, default in zip(SIM_WEATHER[:-1], default_mix):
+            key = f"sim_{period_col}_{period_value}_{horizon}_{w}"
+            st.session_state.setdefault(key, default)
+            st.session_state[key] = min(st.session_state[key], remaining)
+            n_days = st.slider(
+                f"Jumlah Hari {weather_names.get(w, w)}",
+                min_value=0,
+                max_value=max(remaining, 1),
+                disabled=remaining == 0,
+                key=key
+            )
+            day_mix.append(n_days)
+            remaining -= n_days
+        day_mix.append(remaining)
+        st.markdown(f"Jumlah Hari {weather_names.get(SIM_WEATHER[-1])}: **{remaining}** "
+                    f"(sisa dari {horizon} hari)")
+
+        temp_shift = st.slider("Perubahan Suhu (°C)", min_value=-10.0, max_value=10.0,
+                               value=0.0, step=0.5)
+        hum_shift = st.slider("Perubahan Kelembaban (%)", min_value=-30, max_value=30,
+                              value=0, step=1)
+
+    with col2:
+        st.subheader("📈 Estimasi Penyewaan")
+
+        segments, _ = build_weather_segments(df, period_col, period_value, years_key)
+        missing_weather = [weather_names.get(w, w) for w, n_days in zip(SIM_WEATHER, day_mix)
+                           if n_days and len(segments[w]['log_values']) == 0]
+        if missing_weather:
+            st.warning(f"Tidak ada data historis {', '.join(missing_weather)} pada tahun terpilih; "
+                       f"atur jumlah harinya menjadi 0 untuk menjalankan simulasi.")
+        else:
+            totals = simulate_weather_scenario(
+                df, period_col, period_value, years_key, tuple(day_mix),
+                temp_shift, hum_shift
+            )
+            sim_total = np.column_stack([totals, totals.sum(axis=1)])
+            sim_mean = sim_total.mean(axis=0)
+            sim_low, sim_high = np.percentile(sim_total, [2.5, 97.5], axis=0)
+
+            m1, m2, m3 = st.columns(3)
+            with m1:
+                st.metric("🚲 Total Penyewaan", f"{sim_mean[2]:,.0f}")
+            with m2:
+                st.metric("🙋 Casual", f"{sim_mean[0]:,.0f}")
+            with m3:
+                st.metric("🪪 Registered", f"{sim_mean[1]:,.0f}")
+
+            fig, ax = plt.subplots(figsize=(10, 5))
+            labels = ['Casual', 'Registered', 'Total']
+            bars = ax.bar(labels, sim_mean, color=['skyblue', 'teal', '#FFA07A'],
+                          edgecolor='black', linewidth=0.5,
+                          yerr=[sim_mean - sim_low, sim_high - sim_mean], capsize=8)
+
+            ax.set_title('Estimasi Penyewaan Sepeda dengan Interval Prediksi 95%',
+                        fontsize=14, pad=20)
+            ax.set_ylabel('Jumlah Penyewaan', fontsize=12)
+            ax.grid(axis='y', linestyle='--', alpha=0.7)
+            ax.set_axisbelow(True)
+
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close()
+
+            sim_stats = pd.DataFrame(
+                {'Rata-rata': sim_mean, 'Batas Bawah (2.5%)': sim_low, 'Batas Atas (97.5%)': sim_high},
+                index=labels
+            ).round(0)
+            st.dataframe(sim_stats, width='stretch')
+
+            for w, n_days in zip(SIM_WEATHER, day_mix):
+                fallback = segments[w]['fallback']
+                if n_days and fallback:
+                    st.caption(
+                        f"Data historis {weather_names.get(w, w)} pada periode ini kurang dari "
+                        f"{SIM_MIN_SEGMENT_DAYS} hari, sehingga memakai hari dengan cuaca yang sama "
+                        f"dari {SIM_FALLBACK_NAMES[fallback]} ({len(segments[w]['log_values'])} hari)."
+                    )
+
+    st.info("""
+    **Catatan Metode:**
+    - Setiap hari skenario diambil ulang (bootstrap) dari hari historis dengan kondisi cuaca yang sama pada periode terpilih; hari pinjaman dari periode lain disesuaikan ke iklim dan level periode ini
+    - Suhu dan kelembaban setiap hari yang diambil digeser (dibatasi pada rentang yang teramati di periode), lalu dampaknya dihitung dengan regresi log-penyewaan pada semua hari tahun terpilih (suku kuadrat, efek bulan, tahun, dan cuaca)
+    - Level penyewaan setiap hari historis disesuaikan ke tahun terbaru yang dipilih memakai efek tahun dari regresi
+    - Interval prediksi 95% untuk total skenario berasal dari 5.000 replikasi bootstrap
+    """)
+
+st.markdown("---")
+
 # ============================================================================
 # VISUALISASI 4: Analisis Hari Kerja vs Akhir Pekan
 # ============================================================================